@@ -6,142 +6,142 @@ Explosive, colorful, beat-synchronized ASCII animations using asciimatics
 
 import sys
 import os
-import threading
 import time
 import random
-import queue
-from datetime import datetime
 from asciimatics.screen import Screen
-from asciimatics.scene import Scene
-from asciimatics.effects import Stars, Print, Cycle, Snow, Matrix
+from asciimatics.effects import Print, Cycle, Matrix
 from asciimatics.particles import (
-    RingFirework, SerpentFirework, StarFirework, PalmFirework,
-    ParticleEffect, Rain, DropScreen
+    RingFirework, SerpentFirework, StarFirework, PalmFirework
 )
-from asciimatics.renderers import (
-    FigletText, Fire, Rainbow, Plasma,
-    ColourImageFile, Box
-)
-from asciimatics.exceptions import ResizeScreenError, StopApplication
+from asciimatics.renderers import FigletText, Rainbow, Plasma
 import pygame
 import numpy as np
 import librosa
 import soundfile as sf
 
-# Global beat queue for thread communication
-beat_queue = queue.Queue()
-amplitude_queue = queue.Queue()
+# Beat schedule shared between analysis and the render loop
 audio_file = None
-onset_frames = []
-onset_times = []
-current_beat_index = 0
+onset_times = np.array([])
+beat_intensities = np.array([])
 audio_duration = 0
 
+# Beat tracking is accurate at 22.05 kHz mono; a shared hop keeps frames aligned
+ANALYSIS_SR = 22050
+HOP_LENGTH = 512
+
+# Lookup tables for batched sparkle draws
+SPARK_CHARS = np.array(['*', '+', '.', '·', '°'])
+SPARK_COLOURS = np.array([Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW, Screen.COLOUR_CYAN])
+
+FRAME_TIME = 1 / 30.0
+
+CRAZY_TEXTS = ("BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!")
+TEXT_COLOURS = (
+    Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
+    Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN
+)
+FLASH_CHARS = ('*', '#', '@', '█', '▓', '▒', '░')
+
 def detect_onsets_and_amplitude(audio_path):
     """Use librosa to detect onsets (beats) and analyze amplitude"""
-    global onset_frames, onset_times, audio_duration
+    global onset_times, beat_intensities, audio_duration
 
     print("🎵 Loading audio file...")
-    # Load audio file
-    y, sr = librosa.load(audio_path, sr=None)
+    # Load audio file with libsndfile in a single C call, downmix and resample once
+    try:
+        y, sr = sf.read(audio_path, dtype='float32', always_2d=False)
+        y = y.mean(axis=1) if y.ndim == 2 else y
+        if sr != ANALYSIS_SR:
+            y = librosa.resample(y, orig_sr=sr, target_sr=ANALYSIS_SR, res_type='soxr_hq')
+            sr = ANALYSIS_SR
+    except RuntimeError:
+        # Formats libsndfile can't decode still go through librosa's fallback
+        y, sr = librosa.load(audio_path, sr=ANALYSIS_SR, mono=True)
     audio_duration = len(y) / sr
 
     print("💥 Detecting beats and onsets...")
-    # Detect onsets (beats)
-    onset_frames = librosa.onset.onset_detect(
-        y=y, sr=sr,
-        backtrack=True,
-        units='time'
-    )
-
-    # Also get onset strength for more detailed beat tracking
-    onset_envelope = librosa.onset.onset_strength(y=y, sr=sr)
+    # Onset strength drives the beat tracker; computed once and reused
+    onset_envelope = librosa.onset.onset_strength(y=y, sr=sr, hop_length=HOP_LENGTH)
 
     # Get tempo and beat frames
-    tempo, beats = librosa.beat.beat_track(y=y, sr=sr, onset_envelope=onset_envelope)
-    beat_times = librosa.frames_to_time(beats, sr=sr)
-
-    # Get spectral features for visual mapping
-    spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+    tempo, beats = librosa.beat.beat_track(
+        onset_envelope=onset_envelope, sr=sr, hop_length=HOP_LENGTH
+    )
+    beat_times = librosa.frames_to_time(beats, sr=sr, hop_length=HOP_LENGTH)
 
     # RMS energy for amplitude
-    rms = librosa.feature.rms(y=y)[0]
+    rms = librosa.feature.rms(y=y, hop_length=HOP_LENGTH)[0]
+
+    # Precompute normalized intensity for every beat so playback is a lookup
+    rms_frame_duration = audio_duration / len(rms)
+    beat_frame_idx = np.minimum(
+        (beat_times / rms_frame_duration).astype(np.int64), len(rms) - 1
+    )
+    beat_intensities = np.minimum(rms[beat_frame_idx] * 5.0, 1.0)
 
     print(f"🎵 Tempo: {tempo:.1f} BPM")
     print(f"💥 Found {len(beat_times)} beats!")
 
-    onset_times = beat_times.tolist()
-    return beat_times, rms, spectral_centroids, tempo
-
-def audio_player_thread(audio_path, beat_times, rms_values):
-    """Play audio using pygame and send beat events"""
-    global current_beat_index, onset_times
-
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-    pygame.mixer.music.load(audio_path)
-    pygame.mixer.music.play()
-
-    start_time = time.time()
-    rms_frame_duration = audio_duration / len(rms_values)
-
-    while pygame.mixer.music.get_busy():
-        current_time = time.time() - start_time
-
-        # Check for beats
-        while current_beat_index < len(onset_times):
-            if current_time >= onset_times[current_beat_index]:
-                # Determine beat intensity based on surrounding amplitude
-                frame_idx = min(int(current_time / rms_frame_duration), len(rms_values) - 1)
-                intensity = float(rms_values[frame_idx])
-
-                beat_queue.put({
-                    'type': 'beat',
-                    'time': onset_times[current_beat_index],
-                    'index': current_beat_index,
-                    'intensity': min(intensity * 5, 1.0)  # Normalize intensity
-                })
-                current_beat_index += 1
-            else:
-                break
-
-        # Send amplitude updates
-        if current_time < audio_duration:
-            frame_idx = min(int(current_time / rms_frame_duration), len(rms_values) - 1)
-            amplitude_queue.put({
-                'type': 'amplitude',
-                'value': float(rms_values[frame_idx]),
-                'time': current_time
-            })
-
-        time.sleep(0.01)  # Small sleep to prevent CPU spinning
+    onset_times = np.asarray(beat_times)
+    return beat_times, rms, tempo
+
+class CachedPlasma:
+    """Plasma renderer that cycles through frames rendered once at startup"""
+    def __init__(self, height, width, colours, frames=60):
+        plasma = Plasma(height, width, colours)
+        self._frames = []
+        for _ in range(frames):
+            image, colour_map = plasma.rendered_text
+            self._frames.append((list(image), [list(row) for row in colour_map]))
+        self._index = 0
+        self.max_height = height
+        self.max_width = width
+
+    @property
+    def rendered_text(self):
+        frame = self._frames[self._index]
+        self._index = (self._index + 1) % len(self._frames)
+        return frame
+
+# Firework shells per CrazyFirework burst, and how often each type is picked
+FIREWORK_CLASSES = (RingFirework, SerpentFirework, StarFirework, PalmFirework)
+FIREWORK_WEIGHTS = (0.25, 0.375, 0.28125, 0.09375)
+SHELLS_PER_FIREWORK = 3
+
+FIREWORK_PLAN_DTYPE = np.dtype([
+    ('kind', np.int8), ('x', np.int32), ('y', np.int32), ('lifetime', np.int32)
+])
+
+def plan_fireworks(width, height, intensities):
+    """Precompute every firework shell launched by every beat
+
+    Returns (plan, starts) where beat i owns plan[starts[i]:starts[i + 1]],
+    laid out as consecutive groups of SHELLS_PER_FIREWORK shells.
+    """
+    bursts_per_beat = np.minimum((intensities * 10).astype(np.int64) + 2, 8)
+    starts = np.concatenate(([0], np.cumsum(bursts_per_beat * SHELLS_PER_FIREWORK)))
+    n_bursts = int(bursts_per_beat.sum())
+    n_total = n_bursts * SHELLS_PER_FIREWORK
+
+    centre_x = np.repeat(np.random.randint(5, width - 4, n_bursts), SHELLS_PER_FIREWORK)
+    centre_y = np.repeat(np.random.randint(5, height - 4, n_bursts), SHELLS_PER_FIREWORK)
+
+    plan = np.empty(n_total, dtype=FIREWORK_PLAN_DTYPE)
+    plan['kind'] = np.random.choice(len(FIREWORK_CLASSES), n_total, p=FIREWORK_WEIGHTS)
+    plan['x'] = centre_x + np.random.randint(-5, 6, n_total)
+    plan['y'] = centre_y + np.random.randint(-3, 4, n_total)
+    plan['lifetime'] = np.random.randint(15, 26, n_total)
+    return plan, starts
 
 class CrazyFirework:
-    """Custom crazy firework that changes colors"""
-    def __init__(self, screen, x, y):
+    """Custom crazy firework built from a precomputed slice of shells"""
+    def __init__(self, screen, shells):
         self.screen = screen
-        self.effects = []
-
-        # Launch multiple fireworks with different colors
-        colors = [
-            Screen.COLOUR_RED, Screen.COLOUR_GREEN,
-            Screen.COLOUR_YELLOW, Screen.COLOUR_MAGENTA,
-            Screen.COLOUR_CYAN, Screen.COLOUR_WHITE
+        self.effects = [
+            FIREWORK_CLASSES[kind](screen, int(x), int(y), int(lifetime), 20)
+            for kind, x, y, lifetime in shells.tolist()
         ]
 
-        for i in range(3):
-            offset_x = x + random.randint(-5, 5)
-            offset_y = y + random.randint(-3, 3)
-            lifetime = random.randint(15, 25)
-
-            if random.random() < 0.25:
-                self.effects.append(RingFirework(screen, offset_x, offset_y, lifetime, 20))
-            elif random.random() < 0.5:
-                self.effects.append(SerpentFirework(screen, offset_x, offset_y, lifetime, 20))
-            elif random.random() < 0.75:
-                self.effects.append(StarFirework(screen, offset_x, offset_y, lifetime, 20))
-            else:
-                self.effects.append(PalmFirework(screen, offset_x, offset_y, lifetime, 20))
-
 def demo(screen):
     """Main visualization function"""
     global audio_file
@@ -153,39 +153,38 @@ def demo(screen):
         return
 
     # Analyze audio
-    beat_times, rms, spectral_centroids, tempo = detect_onsets_and_amplitude(audio_file)
-
-    # Start audio playback in separate thread
-    audio_thread = threading.Thread(
-        target=audio_player_thread,
-        args=(audio_file, beat_times, rms)
-    )
-    audio_thread.daemon = True
-    audio_thread.start()
+    beat_times, rms, tempo = detect_onsets_and_amplitude(audio_file)
 
     # Create persistent background effects
     effects = [
-        # Stars(screen, screen.width * screen.height // 4),
         Matrix(screen)  # Matrix rain effect
     ]
 
     # Add plasma background
-    plasma = Plasma(screen.height, screen.width, 16)
+    plasma = CachedPlasma(screen.height, screen.width, 16)
     effects.append(
         Print(screen, plasma, x=0, y=0, transparent=True, colour=Screen.COLOUR_GREEN)
     )
 
-    # Title text with fire effect
-    title_text = FigletText("BEATS!", font='banner3')
-    fire_text = Fire(screen.height, 80, "BEATS!", 0.8, 60, screen.colours)
+    # Pre-render the beat texts once; pyfiglet is too slow to run per beat
+    crazy_cache = {
+        text: str(FigletText(text, font='banner')).split('\n')
+        for text in CRAZY_TEXTS
+    }
 
+    # Title text with rainbow cycling
+    title_text = FigletText("BEATS!", font='banner3')
     effects.append(
         Cycle(screen, Rainbow(screen, title_text), screen.height // 2 - 5)
     )
 
+    # Initialise each effect once, as a Scene would; they keep their state
+    # (Matrix trails) from frame to frame after that
+    for effect in effects:
+        effect.reset()
+
     # Beat counter and info
     beat_count = 0
-    last_beat_time = 0
     active_explosions = []
 
     # Color patterns
@@ -197,101 +196,103 @@ def demo(screen):
     ]
     current_scheme = 0
 
-    # Create initial scene
-    scene = Scene(effects, -1, name="BeatVisualizer")
-    scenes = [scene]
-
     frame = 0
     running = True
-    start_time = time.time()
+
+    # Start audio playback; beats are scheduled against this clock
+    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+    pygame.mixer.music.load(audio_file)
+    pygame.mixer.music.play()
+    t0 = time.monotonic()
+    next_frame = t0
+
+    rms_frame_duration = audio_duration / len(rms)
+    beat_cursor = 0
+
+    # Every beat's fireworks are rolled up front so beats only slice the plan
+    firework_plan, firework_starts = plan_fireworks(
+        screen.width, screen.height, beat_intensities
+    )
+
+    # Flash grid coordinates, fixed for the lifetime of the screen
+    flash_xs = np.arange(0, screen.width, 4)
+    flash_ys = np.arange(0, screen.height, 2)
 
     try:
         while running:
-            screen.clear()
-
-            # Check for beats
-            beat_triggered = False
-            try:
-                while not beat_queue.empty():
-                    beat = beat_queue.get_nowait()
-                    beat_triggered = True
-                    beat_count += 1
-
-                    # CRAZY EXPLOSION TIME!
-                    intensity = beat['intensity']
-
-                    # Change color scheme every 8 beats
-                    if beat_count % 8 == 0:
-                        current_scheme = (current_scheme + 1) % len(color_schemes)
-
-                    # Create multiple fireworks
-                    num_fireworks = min(int(intensity * 10) + 2, 8)
-                    for _ in range(num_fireworks):
-                        x = random.randint(5, screen.width - 5)
-                        y = random.randint(5, screen.height - 5)
-
-                        firework = CrazyFirework(screen, x, y)
-                        for effect in firework.effects:
-                            active_explosions.append({
-                                'effect': effect,
-                                'birth': frame,
-                                'lifetime': 40
-                            })
-
-                    # Flash screen on strong beats
-                    if intensity > 0.7:
-                        flash_char = random.choice(['*', '#', '@', '█', '▓', '▒', '░'])
-                        flash_color = random.choice(color_schemes[current_scheme])
-                        for y in range(0, screen.height, 2):
-                            for x in range(0, screen.width, 4):
-                                screen.print_at(flash_char, x, y,
-                                              colour=flash_color)
-
-                    # Add crazy text on major beats
-                    if beat_count % 4 == 0:
-                        crazy_texts = ["BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!"]
-                        text = random.choice(crazy_texts)
-                        text_color = random.choice([
-                            Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
-                            Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN
-                        ])
-                        x_pos = random.randint(0, max(0, screen.width - len(text) * 6))
-                        y_pos = random.randint(0, max(0, screen.height - 5))
-
-                        figlet = FigletText(text, font='banner')
-                        for i, line in enumerate(str(figlet).split('\n')):
-                            if y_pos + i < screen.height:
-                                screen.print_at(line, x_pos, y_pos + i,
-                                              colour=text_color)
-
-            except queue.Empty:
-                pass
-
-            # Check amplitude for continuous effects
-            try:
-                while not amplitude_queue.empty():
-                    amp_data = amplitude_queue.get_nowait()
-                    amplitude = amp_data['value']
-
-                    # Create sparkles based on amplitude
-                    if amplitude > 0.01 and random.random() < amplitude * 2:
-                        for _ in range(int(amplitude * 20)):
-                            x = random.randint(0, screen.width - 1)
-                            y = random.randint(0, screen.height - 1)
-                            spark_char = random.choice(['*', '+', '.', '·', '°'])
-                            spark_color = random.choice([
-                                Screen.COLOUR_WHITE,
-                                Screen.COLOUR_YELLOW,
-                                Screen.COLOUR_CYAN
-                            ])
-                            screen.print_at(spark_char, x, y, colour=spark_color)
-
-            except queue.Empty:
-                pass
+            # Only wipe the back buffer; refresh() diffs it against the front
+            # buffer and emits just the cells that changed since last frame
+            screen.clear_buffer(Screen.COLOUR_WHITE, Screen.A_NORMAL, Screen.COLOUR_BLACK)
+            now = time.monotonic() - t0
+
+            # Fire every beat whose onset time has passed
+            new_cursor = int(np.searchsorted(onset_times, now, side='right'))
+            beat_triggered = new_cursor > beat_cursor
+            fired = range(beat_cursor, new_cursor)
+            beat_cursor = new_cursor
+            for beat in fired:
+                beat_count += 1
+
+                # CRAZY EXPLOSION TIME!
+                intensity = float(beat_intensities[beat])
+
+                # Change color scheme every 8 beats
+                if beat_count % 8 == 0:
+                    current_scheme = (current_scheme + 1) % len(color_schemes)
+
+                # Create multiple fireworks
+                for shell in range(firework_starts[beat], firework_starts[beat + 1],
+                                   SHELLS_PER_FIREWORK):
+                    firework = CrazyFirework(
+                        screen, firework_plan[shell:shell + SHELLS_PER_FIREWORK]
+                    )
+                    for effect in firework.effects:
+                        active_explosions.append({
+                            'effect': effect,
+                            'birth': frame,
+                            'lifetime': 40
+                        })
+
+                # Flash screen on strong beats
+                if intensity > 0.7:
+                    flash_char = random.choice(FLASH_CHARS)
+                    flash_color = random.choice(color_schemes[current_scheme])
+                    flash_row = ((flash_char + ' ' * 3) * len(flash_xs))[:screen.width]
+                    for y in flash_ys:
+                        screen.print_at(flash_row, 0, int(y),
+                                      colour=flash_color, transparent=True)
+
+                # Add crazy text on major beats
+                if beat_count % 4 == 0:
+                    text = random.choice(CRAZY_TEXTS)
+                    text_color = random.choice(TEXT_COLOURS)
+                    x_pos = random.randint(0, max(0, screen.width - len(text) * 6))
+                    y_pos = random.randint(0, max(0, screen.height - 5))
+
+                    for i, line in enumerate(crazy_cache[text]):
+                        if y_pos + i < screen.height:
+                            screen.print_at(line, x_pos, y_pos + i,
+                                          colour=text_color)
+
+            # Read amplitude for continuous effects straight from the RMS curve
+            if now < audio_duration:
+                amplitude = float(rms[min(int(now / rms_frame_duration), len(rms) - 1)])
+
+                # Create sparkles based on amplitude
+                if amplitude > 0.01 and random.random() < amplitude * 2:
+                    n = int(amplitude * 20)
+                    xs = np.random.randint(0, screen.width, n)
+                    ys = np.random.randint(0, screen.height, n)
+                    cs = SPARK_CHARS[np.random.randint(0, len(SPARK_CHARS), n)]
+                    cols = SPARK_COLOURS[np.random.randint(0, len(SPARK_COLOURS), n)]
+                    # Unbox once with tolist() rather than per element in the loop
+                    for spark_char, x, y, spark_color in zip(
+                        cs.tolist(), xs.tolist(), ys.tolist(), cols.tolist()
+                    ):
+                        screen.print_at(spark_char, x, y, colour=spark_color)
 
             # Update and render persistent effects
             for effect in effects:
-                effect.reset()
                 effect._update(frame)
 
             # Update and render active explosions
@@ -300,13 +301,12 @@ def demo(screen):
                 if frame - exp['birth'] < exp['lifetime']
             ]
 
+            # Fireworks reset themselves on construction
             for exp in active_explosions:
-                exp['effect'].reset()
                 exp['effect']._update(frame)
 
             # Display info
-            elapsed = time.time() - start_time
-            info_text = f"Time: {elapsed:.1f}s | Beats: {beat_count} | Tempo: {tempo:.0f} BPM"
+            info_text = f"Time: {now:.1f}s | Beats: {beat_count} | Tempo: {tempo:.0f} BPM"
             screen.print_at(info_text, 2, screen.height - 2,
                           colour=Screen.COLOUR_WHITE)
 
@@ -327,7 +327,17 @@ def demo(screen):
                 running = False
 
             frame += 1
-            time.sleep(0.03)  # ~30 FPS
+
+            # Hold a fixed ~30 FPS grid, dropping slots the frame overran, but
+            # wake early when the next beat lands before the next slot
+            frame_end = time.monotonic()
+            while next_frame <= frame_end:
+                next_frame += FRAME_TIME
+            wake = (next_frame if beat_cursor >= len(onset_times)
+                    else min(next_frame, t0 + onset_times[beat_cursor]))
+            sleep_for = wake - frame_end
+            if sleep_for > 0:
+                time.sleep(sleep_for)
 
     except Exception as e:
         screen.print_at(f"Error: {e}", 0, 0)
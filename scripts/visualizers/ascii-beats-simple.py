@@ -8,26 +8,52 @@ import sys
 import os
 import time
 import random
-import threading
 from asciimatics.screen import Screen
-from asciimatics.scene import Scene
-from asciimatics.effects import Stars, Print, Cycle, Matrix
+from asciimatics.effects import Print, Cycle, Matrix
 from asciimatics.particles import (
     RingFirework, SerpentFirework, StarFirework, PalmFirework
 )
 from asciimatics.renderers import FigletText, Rainbow, Plasma
 import pygame
 
+# Lookup tables for batched sparkle draws
+SPARK_CHARS = ('*', '+', '.', '·')
+SPARK_COLOURS = (Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW, Screen.COLOUR_CYAN)
+NUM_SPARKLES = 20
+
+CRAZY_TEXTS = ("BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!")
+TEXT_COLOURS = (
+    Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
+    Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN
+)
+FLASH_CHARS = ('*', '#', '@', '█')
+FIREWORK_TYPES = (RingFirework, SerpentFirework, StarFirework, PalmFirework)
+
+FRAME_TIME = 1 / 30.0
+
+class CachedPlasma:
+    """Plasma renderer that cycles through frames rendered once at startup"""
+    def __init__(self, height, width, colours, frames=60):
+        plasma = Plasma(height, width, colours)
+        self._frames = []
+        for _ in range(frames):
+            image, colour_map = plasma.rendered_text
+            self._frames.append((list(image), [list(row) for row in colour_map]))
+        self._index = 0
+        self.max_height = height
+        self.max_width = width
+
+    @property
+    def rendered_text(self):
+        frame = self._frames[self._index]
+        self._index = (self._index + 1) % len(self._frames)
+        return frame
+
 def demo(screen):
     """Main visualization function with manual beat simulation"""
 
     audio_file = sys.argv[1] if len(sys.argv) > 1 else "woah-dope8.wav"
 
-    # Start audio playback
-    pygame.mixer.init()
-    pygame.mixer.music.load(audio_file)
-    pygame.mixer.music.play()
-
     # Create persistent background effects
     effects = []
 
@@ -35,17 +61,34 @@ def demo(screen):
     effects.append(Matrix(screen))
 
     # Plasma background
-    plasma = Plasma(screen.height, screen.width, 16)
+    plasma = CachedPlasma(screen.height, screen.width, 16)
     effects.append(
         Print(screen, plasma, x=0, y=0, transparent=True, colour=Screen.COLOUR_GREEN)
     )
 
+    # Pre-render the beat texts once; pyfiglet is too slow to run per beat
+    crazy_cache = {
+        text: str(FigletText(text, font='banner')).split('\n')
+        for text in CRAZY_TEXTS
+    }
+
     # Title with rainbow effect
     title_text = FigletText("BEATS!", font='banner3')
     effects.append(
         Cycle(screen, Rainbow(screen, title_text), screen.height // 2 - 5)
     )
 
+    # Initialise each effect once, as a Scene would; they keep their state
+    # (Matrix trails) from frame to frame after that
+    for effect in effects:
+        effect.reset()
+
+    # Start audio playback once the effects (and their caches) are built;
+    # a 2048-sample buffer avoids underruns under render load
+    pygame.mixer.init(buffer=2048)
+    pygame.mixer.music.load(audio_file)
+    pygame.mixer.music.play()
+
     # Manual beat timing (approximate BPM)
     beat_interval = 0.5  # 120 BPM
     last_beat_time = time.time()
@@ -63,11 +106,18 @@ def demo(screen):
     ]
     current_scheme = 0
 
+    # Flash grid coordinates, fixed for the lifetime of the screen
+    flash_cols = len(range(0, screen.width, 5))
+    flash_ys = range(0, screen.height, 3)
+
     frame = 0
     start_time = time.time()
+    next_frame = time.monotonic()
 
     while pygame.mixer.music.get_busy():
-        screen.clear()
+        # Only wipe the back buffer; refresh() diffs it against the front
+        # buffer and emits just the cells that changed since last frame
+        screen.clear_buffer(Screen.COLOUR_WHITE, Screen.A_NORMAL, Screen.COLOUR_BLACK)
 
         # Check for beat timing
         current_time = time.time()
@@ -86,11 +136,7 @@ def demo(screen):
                 y = random.randint(5, screen.height - 5)
 
                 # Random firework type
-                firework_types = [
-                    RingFirework, SerpentFirework,
-                    StarFirework, PalmFirework
-                ]
-                firework_class = random.choice(firework_types)
+                firework_class = random.choice(FIREWORK_TYPES)
                 lifetime = random.randint(15, 25)
 
                 effect = firework_class(screen, x, y, lifetime, 20)
@@ -102,42 +148,33 @@ def demo(screen):
 
             # Flash screen on beat
             if beat_count % 2 == 0:
-                flash_char = random.choice(['*', '#', '@', '█'])
+                flash_char = random.choice(FLASH_CHARS)
                 flash_color = random.choice(color_schemes[current_scheme])
-                for y in range(0, screen.height, 3):
-                    for x in range(0, screen.width, 5):
-                        screen.print_at(flash_char, x, y, colour=flash_color)
+                flash_row = ((flash_char + ' ' * 4) * flash_cols)[:screen.width]
+                for y in flash_ys:
+                    screen.print_at(flash_row, 0, y, colour=flash_color, transparent=True)
 
             # Add crazy text every 4 beats
             if beat_count % 4 == 0:
-                crazy_texts = ["BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!"]
-                text = random.choice(crazy_texts)
-                text_color = random.choice([
-                    Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
-                    Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN
-                ])
+                text = random.choice(CRAZY_TEXTS)
+                text_color = random.choice(TEXT_COLOURS)
                 x_pos = random.randint(0, max(0, screen.width - 30))
                 y_pos = random.randint(5, max(5, screen.height - 10))
 
-                figlet = FigletText(text, font='banner')
-                for i, line in enumerate(str(figlet).split('\n')):
+                for i, line in enumerate(crazy_cache[text]):
                     if y_pos + i < screen.height - 2:
                         screen.print_at(line, x_pos, y_pos + i, colour=text_color)
 
-        # Random sparkles
-        for _ in range(20):
-            x = random.randint(0, screen.width - 1)
-            y = random.randint(0, screen.height - 1)
-            spark_char = random.choice(['*', '+', '.', '·'])
-            spark_color = random.choice([
-                Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW,
-                Screen.COLOUR_CYAN
-            ])
+        # Random sparkles, drawn in one batch per attribute
+        xs = random.choices(range(screen.width), k=NUM_SPARKLES)
+        ys = random.choices(range(screen.height), k=NUM_SPARKLES)
+        cs = random.choices(SPARK_CHARS, k=NUM_SPARKLES)
+        cols = random.choices(SPARK_COLOURS, k=NUM_SPARKLES)
+        for x, y, spark_char, spark_color in zip(xs, ys, cs, cols):
             screen.print_at(spark_char, x, y, colour=spark_color)
 
         # Update persistent effects
         for effect in effects:
-            effect.reset()
             effect._update(frame)
 
         # Update active explosions
@@ -146,8 +183,8 @@ def demo(screen):
             if frame - exp['birth'] < exp['lifetime']
         ]
 
+        # Fireworks reset themselves on construction
         for exp in active_explosions:
-            exp['effect'].reset()
             exp['effect']._update(frame)
 
         # Display info
@@ -172,7 +209,14 @@ def demo(screen):
             break
 
         frame += 1
-        time.sleep(0.03)  # ~30 FPS
+
+        # Fixed ~30 FPS cadence; on overruns drop the frame instead of drifting
+        next_frame += FRAME_TIME
+        sleep_for = next_frame - time.monotonic()
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+        else:
+            next_frame = time.monotonic()
 
     pygame.mixer.music.stop()
     pygame.quit()
@@ -10,6 +10,7 @@ import time
 import random
 import threading
 import math
+from collections import deque
 from asciimatics.screen import Screen
 from asciimatics.scene import Scene
 from asciimatics.effects import Stars, Print, Cycle, Matrix, Snow
@@ -19,6 +20,7 @@ from asciimatics.particles import (
 )
 from asciimatics.renderers import FigletText, Rainbow, Plasma, Fire
 import pygame
+import numpy as np
 
 # ASCII art patterns from the URLs you wanted
 GEOMETRY_PATTERNS = [
@@ -77,6 +79,93 @@ DICE_PATTERNS = [
     """,
 ]
 
+# Beat texts, pre-rendered once at import so beats only do a dict lookup
+CRAZY_TEXTS = ("BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!", "WILD!", "SICK!")
+
+def figlet_font(text):
+    """Pick the figlet font used for a beat text"""
+    return 'banner' if len(text) < 6 else 'standard'
+
+FIGLET_CACHE = {
+    (text, figlet_font(text)): str(FigletText(text, font=figlet_font(text))).split('\n')
+    for text in CRAZY_TEXTS
+}
+
+# Lookup tables for the per-beat picks and the batched overlay phases
+FLASH_CHARS = ('█', '▓', '▒', '░', '*', '#', '@')
+TEXT_COLOURS = (
+    Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
+    Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN,
+    Screen.COLOUR_WHITE
+)
+SPARK_CHARS = np.array([ord(c) for c in '*+.·°×÷'], dtype='<u4')
+SPARK_COLOURS = np.array([
+    Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW,
+    Screen.COLOUR_CYAN, Screen.COLOUR_MAGENTA
+], dtype=np.uint8)
+BLOCK_CHARS = np.array([ord(c) for c in '▀▄█▌▐░▒▓'], dtype='<u4')
+WAVE_COLOURS = np.array([Screen.COLOUR_CYAN, Screen.COLOUR_BLUE], dtype=np.uint8)
+FIREWORK_TYPES_INSANE = (RingFirework, SerpentFirework, StarFirework, PalmFirework)
+
+class CachedPlasma:
+    """Plasma renderer that cycles through frames rendered once at startup"""
+    def __init__(self, height, width, colours, frames=60):
+        plasma = Plasma(height, width, colours)
+        self._frames = []
+        for _ in range(frames):
+            image, colour_map = plasma.rendered_text
+            self._frames.append((list(image), [list(row) for row in colour_map]))
+        self._index = 0
+        self.max_height = height
+        self.max_width = width
+
+    @property
+    def rendered_text(self):
+        frame = self._frames[self._index]
+        self._index = (self._index + 1) % len(self._frames)
+        return frame
+
+class CellGrid:
+    """Single-character overlay cells written to the screen in row runs
+
+    Phases stamp whole batches of cells with NumPy indexing; flush() then
+    emits one transparent print_at per colour per row, padding the gaps
+    with spaces, instead of one call per cell.
+    """
+
+    def __init__(self, height, width):
+        self.cells = np.zeros((height, width), dtype='<u4')  # code point, 0 = empty
+        self.colours = np.zeros((height, width), dtype=np.uint8)
+
+    def stamp(self, ys, xs, chars, colours):
+        # NumPy leaves the winner of repeated fancy-index writes unspecified,
+        # so collapse collisions to the last writer before touching the grid
+        ys, xs, chars, colours = np.broadcast_arrays(ys, xs, chars, colours)
+        cell_ids = ys * self.cells.shape[1] + xs
+        _, first = np.unique(cell_ids[::-1], return_index=True)
+        keep = len(cell_ids) - 1 - first
+        self.cells[ys[keep], xs[keep]] = chars[keep]
+        self.colours[ys[keep], xs[keep]] = colours[keep]
+
+    def flush(self, screen):
+        for y in np.flatnonzero(self.cells.any(axis=1)).tolist():
+            row = self.cells[y]
+            xs = np.flatnonzero(row)
+            colours = self.colours[y, xs]
+            for colour in np.unique(colours).tolist():
+                cols = xs[colours == colour]
+                start = int(cols[0])
+                span = np.full(int(cols[-1]) + 1 - start, ord(' '), dtype='<u4')
+                span[cols - start] = row[cols]
+                # Transparent spaces leave other colours' cells untouched
+                screen.print_at(span.tobytes().decode('utf-32-le'),
+                                start, y, colour=colour, transparent=True)
+        self.cells[:] = 0
+
+# Frames between get_busy() checks for the end of the track; at 40 FPS
+# the loop still stops within a few hundred milliseconds of the song ending
+TRACK_POLL_FRAMES = 8
+
 def demo(screen):
     """Main visualization with simulated beats - NO LIBROSA BULLSHIT"""
 
@@ -88,11 +177,6 @@ def demo(screen):
         time.sleep(2)
         return
 
-    # Start audio playback
-    pygame.mixer.init()
-    pygame.mixer.music.load(audio_file)
-    pygame.mixer.music.play()
-
     # Create background effects
     effects = []
 
@@ -100,7 +184,7 @@ def demo(screen):
     effects.append(Matrix(screen))
 
     # Plasma psychedelic background
-    plasma = Plasma(screen.height, screen.width, 16)
+    plasma = CachedPlasma(screen.height, screen.width, 16)
     effects.append(
         Print(screen, plasma, x=0, y=0, transparent=True, colour=Screen.COLOUR_GREEN)
     )
@@ -114,19 +198,37 @@ def demo(screen):
         Cycle(screen, Rainbow(screen, title_text), screen.height // 2 - 8)
     )
 
+    # Periodic rain, stepped only during its window; it is restarted once
+    # its drops have all died instead of being rebuilt every frame
+    rain = Rain(screen, 100)
+
+    # Initialise each effect once, as a Scene would; they keep their state
+    # (Matrix trails, star positions) from frame to frame after that
+    for effect in effects:
+        effect.reset()
+
+    # Start audio playback once the effects (and their caches) are built
+    pygame.mixer.init()
+    pygame.mixer.music.load(audio_file)
+    pygame.mixer.music.play()
+
     # Variables for beat simulation
     frame = 0
-    start_time = time.time()
+    start_time = time.monotonic()
     beat_count = 0
-    active_explosions = []
+    active_explosions = deque()  # (death_frame, effect), oldest first
 
     # Beat timing (simulate 120 BPM)
     beat_interval = 0.5
-    last_beat_time = time.time()
+    last_beat_time = time.monotonic()
 
     # Sub-beat timing for extra craziness
     sub_beat_interval = 0.125
-    last_sub_beat = time.time()
+    last_sub_beat = time.monotonic()
+
+    # Frame pacing (~40 FPS for extra smoothness)
+    frame_sleep = 0.025
+    next_deadline = time.monotonic()
 
     # Color schemes
     color_schemes = [
@@ -135,18 +237,37 @@ def demo(screen):
         [Screen.COLOUR_GREEN, Screen.COLOUR_YELLOW, Screen.COLOUR_WHITE],
         [Screen.COLOUR_MAGENTA, Screen.COLOUR_YELLOW, Screen.COLOUR_CYAN],
     ]
+    scheme_luts = np.array(color_schemes, dtype=np.uint8)
     current_scheme_idx = 0
 
-    # ASCII art cycling
-    art_patterns = GEOMETRY_PATTERNS + STAR_PATTERNS + FRACTAL_PATTERNS + DICE_PATTERNS
+    # ASCII art cycling, split into lines once
+    art_patterns = [
+        art.strip().split('\n')
+        for art in GEOMETRY_PATTERNS + STAR_PATTERNS + FRACTAL_PATTERNS + DICE_PATTERNS
+    ]
+
+    # Overlay grid for the single-cell flash, sparkle and block phases
+    overlay = CellGrid(screen.height, screen.width)
+    rng = np.random.default_rng()
+    rand = random.Random()
+    flash_ys, flash_xs = np.mgrid[0:screen.height:2, 0:screen.width:3]
+    flash_ys, flash_xs = flash_ys.ravel(), flash_xs.ravel()
+
+    # Per-column sine tables; each frame's phase shift uses the angle-addition
+    # identity so the wave needs no per-column trig
+    wave_xs = np.arange(screen.width)
+    wave_sin = np.sin(wave_xs * 0.2)
+    wave_cos = np.cos(wave_xs * 0.2)
 
     running = True
     intensity = 0.5
 
-    while running and pygame.mixer.music.get_busy():
-        screen.clear()
+    while running:
+        # Only wipe the back buffer; refresh() diffs it against the front
+        # buffer and emits just the cells that changed since last frame
+        screen.clear_buffer(Screen.COLOUR_WHITE, Screen.A_NORMAL, Screen.COLOUR_BLACK)
 
-        current_time = time.time()
+        current_time = time.monotonic()
         elapsed = current_time - start_time
 
         # Main beat
@@ -160,64 +281,52 @@ def demo(screen):
                 current_scheme_idx = (current_scheme_idx + 1) % len(color_schemes)
 
             # Intensity variations
-            intensity = 0.8 + random.random() * 0.2
+            intensity = 0.8 + rand.random() * 0.2
 
             # Create MASSIVE firework explosions
             num_fireworks = int(intensity * 12)
             for _ in range(num_fireworks):
-                x = random.randint(5, screen.width - 5)
-                y = random.randint(5, screen.height - 5)
+                x = rand.randint(5, screen.width - 5)
+                y = rand.randint(5, screen.height - 5)
 
                 # Mix all firework types
-                firework_types = [RingFirework, SerpentFireework, StarFirework, PalmFirework]
-                for ft in random.sample(firework_types, 2):
-                    effect = ft(screen, x + random.randint(-3, 3),
-                               y + random.randint(-2, 2),
-                               random.randint(20, 30), 25)
-                    active_explosions.append({
-                        'effect': effect,
-                        'birth': frame,
-                        'lifetime': 50
-                    })
+                for ft in rand.sample(FIREWORK_TYPES_INSANE, 2):
+                    effect = ft(screen, x + rand.randint(-3, 3),
+                               y + rand.randint(-2, 2),
+                               rand.randint(20, 30), 25)
+                    active_explosions.append((frame + 50, effect))
 
             # Screen flash on strong beats
             if beat_count % 2 == 0:
-                flash_chars = ['█', '▓', '▒', '░', '*', '#', '@']
-                flash_char = random.choice(flash_chars)
-                current_colors = color_schemes[current_scheme_idx]
+                flash_char = rand.choice(FLASH_CHARS)
+                current_colors = scheme_luts[current_scheme_idx]
 
-                for y in range(0, screen.height, 2):
-                    for x in range(0, screen.width, 3):
-                        if random.random() < intensity:
-                            screen.print_at(flash_char, x, y,
-                                          colour=random.choice(current_colors))
+                lit = rng.random(len(flash_xs)) < intensity
+                n_lit = int(lit.sum())
+                overlay.stamp(flash_ys[lit], flash_xs[lit], ord(flash_char),
+                              current_colors[rng.integers(0, len(current_colors), n_lit)])
+                overlay.flush(screen)
 
             # CRAZY TEXT EXPLOSIONS
             if beat_count % 4 == 0:
-                crazy_texts = ["BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!", "WILD!", "SICK!"]
                 for _ in range(3):  # Multiple texts
-                    text = random.choice(crazy_texts)
-                    text_color = random.choice([
-                        Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
-                        Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN,
-                        Screen.COLOUR_WHITE
-                    ])
-                    x_pos = random.randint(0, max(0, screen.width - 30))
-                    y_pos = random.randint(5, max(5, screen.height - 10))
-
-                    figlet = FigletText(text, font='banner' if len(text) < 6 else 'standard')
-                    for i, line in enumerate(str(figlet).split('\n')):
+                    text = rand.choice(CRAZY_TEXTS)
+                    text_color = rand.choice(TEXT_COLOURS)
+                    x_pos = rand.randint(0, max(0, screen.width - 30))
+                    y_pos = rand.randint(5, max(5, screen.height - 10))
+
+                    for i, line in enumerate(FIGLET_CACHE[(text, figlet_font(text))]):
                         if y_pos + i < screen.height - 2:
                             screen.print_at(line, x_pos, y_pos + i, colour=text_color)
 
             # Display random ASCII art patterns
-            if random.random() < 0.7:
-                art = random.choice(art_patterns)
-                art_x = random.randint(0, max(0, screen.width - 20))
-                art_y = random.randint(0, max(0, screen.height - 10))
-                art_color = random.choice(color_schemes[current_scheme_idx])
+            if rand.random() < 0.7:
+                art = rand.choice(art_patterns)
+                art_x = rand.randint(0, max(0, screen.width - 20))
+                art_y = rand.randint(0, max(0, screen.height - 10))
+                art_color = rand.choice(color_schemes[current_scheme_idx])
 
-                for i, line in enumerate(art.strip().split('\n')):
+                for i, line in enumerate(art):
                     if art_y + i < screen.height - 2:
                         screen.print_at(line, art_x, art_y + i, colour=art_color)
 
@@ -227,46 +336,44 @@ def demo(screen):
 
             # Sparkles and particles
             num_sparkles = int(intensity * 50)
-            for _ in range(num_sparkles):
-                x = random.randint(0, screen.width - 1)
-                y = random.randint(0, screen.height - 1)
-                spark_chars = ['*', '+', '.', '·', '°', '×', '÷']
-                spark_char = random.choice(spark_chars)
-                spark_color = random.choice([
-                    Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW,
-                    Screen.COLOUR_CYAN, Screen.COLOUR_MAGENTA
-                ])
-                screen.print_at(spark_char, x, y, colour=spark_color)
-
-            # Random color blocks
-            if random.random() < 0.3:
-                block_chars = ['▀', '▄', '█', '▌', '▐', '░', '▒', '▓']
-                for _ in range(10):
-                    x = random.randint(0, screen.width - 5)
-                    y = random.randint(0, screen.height - 1)
-                    block = random.choice(block_chars) * random.randint(3, 8)
-                    color = random.choice(color_schemes[current_scheme_idx])
-                    screen.print_at(block, x, y, colour=color)
+            pts = rng.integers([0, 0], [screen.height, screen.width], size=(num_sparkles, 2))
+            overlay.stamp(
+                pts[:, 0], pts[:, 1],
+                SPARK_CHARS[rng.integers(0, len(SPARK_CHARS), num_sparkles)],
+                SPARK_COLOURS[rng.integers(0, len(SPARK_COLOURS), num_sparkles)]
+            )
+
+            # Random color blocks: 10 horizontal runs of one repeated character
+            if rand.random() < 0.3:
+                current_colors = scheme_luts[current_scheme_idx]
+                lengths = rng.integers(3, 9, 10)
+                offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+                xs = np.repeat(rng.integers(0, screen.width - 4, 10), lengths) + offsets
+                ys = np.repeat(rng.integers(0, screen.height, 10), lengths)
+                chars = np.repeat(BLOCK_CHARS[rng.integers(0, len(BLOCK_CHARS), 10)], lengths)
+                colors = np.repeat(current_colors[rng.integers(0, len(current_colors), 10)], lengths)
+                on_screen = xs < screen.width
+                overlay.stamp(ys[on_screen], xs[on_screen], chars[on_screen], colors[on_screen])
+
+            overlay.flush(screen)
 
         # Update persistent background effects
         for effect in effects:
-            effect.reset()
             effect._update(frame)
 
-        # Update active explosions
-        active_explosions = [
-            exp for exp in active_explosions
-            if frame - exp['birth'] < exp['lifetime']
-        ]
+        # Update active explosions; they all share one lifetime, so the
+        # deque stays sorted by death frame
+        while active_explosions and active_explosions[0][0] <= frame:
+            active_explosions.popleft()
 
-        for exp in active_explosions:
-            exp['effect'].reset()
-            exp['effect']._update(frame)
+        # Fireworks reset themselves on construction
+        for _, effect in active_explosions:
+            effect._update(frame)
 
         # Add rain effect periodically
         if beat_count % 8 == 0 and frame % 100 < 50:
-            rain = Rain(screen, 100)
-            rain.reset()
+            if not rain._active_systems:
+                rain.reset()
             rain._update(frame)
 
         # Status bar
@@ -288,12 +395,13 @@ def demo(screen):
 
         # Sine wave visualization
         wave_height = int(math.sin(elapsed * 3) * 5 + 10)
-        wave_char = "~"
-        for x in range(screen.width):
-            y = int(math.sin(x * 0.2 + elapsed * 5) * wave_height + screen.height // 2)
-            if 0 <= y < screen.height - 3:
-                screen.print_at(wave_char, x, y,
-                              colour=random.choice([Screen.COLOUR_CYAN, Screen.COLOUR_BLUE]))
+        phase_sin, phase_cos = math.sin(elapsed * 5), math.cos(elapsed * 5)
+        wave_ys = ((wave_sin * phase_cos + wave_cos * phase_sin) * wave_height
+                   + screen.height // 2).astype(np.int32)
+        visible = (wave_ys >= 0) & (wave_ys < screen.height - 3)
+        overlay.stamp(wave_ys[visible], wave_xs[visible], ord('~'),
+                      WAVE_COLOURS[rng.integers(0, 2, int(visible.sum()))])
+        overlay.flush(screen)
 
         screen.refresh()
 
@@ -302,8 +410,20 @@ def demo(screen):
         if event and event.key_code in [ord('q'), ord('Q'), Screen.ctrl('c')]:
             running = False
 
+        # Stop when the song ends, polling the mixer only every few frames
+        if frame % TRACK_POLL_FRAMES == 0 and not pygame.mixer.music.get_busy():
+            running = False
+
         frame += 1
-        time.sleep(0.025)  # ~40 FPS for extra smoothness
+
+        # Sleep to a fixed cadence so heavy frames don't push later ones
+        # back; on an overrun, drop the frame rather than catch up
+        next_deadline += frame_sleep
+        delay = next_deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_deadline = time.monotonic()
 
     # Cleanup
     pygame.mixer.music.stop()
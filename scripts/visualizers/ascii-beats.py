@@ -10,6 +10,8 @@ import os
 import time
 import random
 import argparse
+from collections import deque
+from dataclasses import dataclass
 from enum import Enum
 from asciimatics.screen import Screen
 from asciimatics.effects import Stars, Print, Cycle, Matrix, Snow
@@ -19,6 +21,7 @@ from asciimatics.particles import (
 )
 from asciimatics.renderers import FigletText, Rainbow, Plasma, Fire
 import pygame
+import numpy as np
 
 class VisualizerMode(Enum):
     SIMPLE = "simple"      # Minimal effects, low CPU
@@ -50,6 +53,134 @@ STAR_PATTERNS = [
     """,
 ]
 
+# Beat texts, pre-rendered once at import so beats only do a dict lookup
+CRAZY_TEXTS_STANDARD = ("BOOM!", "BANG!", "WOW!")
+CRAZY_TEXTS_INSANE = CRAZY_TEXTS_STANDARD + ("CRAZY!", "INSANE!", "WILD!", "SICK!")
+
+def figlet_font(text):
+    """Pick the figlet font used for a beat text"""
+    return 'banner' if len(text) < 6 else 'standard'
+
+FIGLET_CACHE = {
+    (text, figlet_font(text)): str(FigletText(text, font=figlet_font(text))).split('\n')
+    for text in CRAZY_TEXTS_INSANE
+}
+
+# Lookup tables for the per-beat picks and the batched overlay phases
+FLASH_CHARS_STANDARD = ('*', '#')
+FLASH_CHARS_INSANE = ('█', '▓', '▒', '░')
+TEXT_COLOURS = (
+    Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
+    Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN
+)
+SPARK_CHARS_STANDARD = np.array([ord(c) for c in '*+.'], dtype='<u4')
+SPARK_CHARS_INSANE = np.array([ord(c) for c in '*+.·°×÷'], dtype='<u4')
+SPARK_COLOURS = np.array([
+    Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW, Screen.COLOUR_CYAN
+], dtype=np.uint8)
+FIREWORK_TYPES_STANDARD = (RingFirework, SerpentFirework, StarFirework)
+FIREWORK_TYPES_INSANE = (RingFirework, SerpentFirework, StarFirework, PalmFirework)
+
+@dataclass(frozen=True, slots=True)
+class ModeCfg:
+    """Per-mode settings, looked up once when demo() starts"""
+    frame_sleep: float
+    sub_beat_interval: float
+    max_explosions: int
+    fireworks_per_beat: int
+    firework_lifetime: int
+    scheme_period: int         # beats between colour scheme changes
+    intensity_base: float
+    intensity_range: float
+    overlays: bool             # flash, text, art and sparkle phases
+    flash_chars: tuple
+    flash_step: int
+    crazy_texts: tuple
+    sparkle_count: int         # sparkles per sub-beat at full intensity
+    sparkle_chars: np.ndarray
+
+MODE_TABLE = {
+    VisualizerMode.SIMPLE: ModeCfg(
+        frame_sleep=1.0 / 30, sub_beat_interval=0.25, max_explosions=20,
+        fireworks_per_beat=1, firework_lifetime=30, scheme_period=16,
+        intensity_base=0.5, intensity_range=0.0, overlays=False,
+        flash_chars=FLASH_CHARS_STANDARD, flash_step=4,
+        crazy_texts=CRAZY_TEXTS_STANDARD, sparkle_count=0,
+        sparkle_chars=SPARK_CHARS_STANDARD,
+    ),
+    VisualizerMode.STANDARD: ModeCfg(
+        frame_sleep=1.0 / 40, sub_beat_interval=0.125, max_explosions=40,
+        fireworks_per_beat=3, firework_lifetime=50, scheme_period=8,
+        intensity_base=0.7, intensity_range=0.3, overlays=True,
+        flash_chars=FLASH_CHARS_STANDARD, flash_step=4,
+        crazy_texts=CRAZY_TEXTS_STANDARD, sparkle_count=30,
+        sparkle_chars=SPARK_CHARS_STANDARD,
+    ),
+    VisualizerMode.INSANE: ModeCfg(
+        frame_sleep=1.0 / 40, sub_beat_interval=0.125, max_explosions=100,
+        fireworks_per_beat=3, firework_lifetime=50, scheme_period=8,
+        intensity_base=0.7, intensity_range=0.3, overlays=True,
+        flash_chars=FLASH_CHARS_INSANE, flash_step=3,
+        crazy_texts=CRAZY_TEXTS_INSANE, sparkle_count=50,
+        sparkle_chars=SPARK_CHARS_INSANE,
+    ),
+}
+
+class CachedPlasma:
+    """Plasma renderer that cycles through frames rendered once at startup"""
+    def __init__(self, height, width, colours, frames=60):
+        plasma = Plasma(height, width, colours)
+        self._frames = []
+        for _ in range(frames):
+            image, colour_map = plasma.rendered_text
+            self._frames.append((list(image), [list(row) for row in colour_map]))
+        self._index = 0
+        self.max_height = height
+        self.max_width = width
+
+    @property
+    def rendered_text(self):
+        frame = self._frames[self._index]
+        self._index = (self._index + 1) % len(self._frames)
+        return frame
+
+class CellGrid:
+    """Single-character overlay cells written to the screen in row runs
+
+    Phases stamp whole batches of cells with NumPy indexing; flush() then
+    emits one transparent print_at per colour per row, padding the gaps
+    with spaces, instead of one call per cell.
+    """
+
+    def __init__(self, height, width):
+        self.cells = np.zeros((height, width), dtype='<u4')  # code point, 0 = empty
+        self.colours = np.zeros((height, width), dtype=np.uint8)
+
+    def stamp(self, ys, xs, chars, colours):
+        # NumPy leaves the winner of repeated fancy-index writes unspecified,
+        # so collapse collisions to the last writer before touching the grid
+        ys, xs, chars, colours = np.broadcast_arrays(ys, xs, chars, colours)
+        cell_ids = ys * self.cells.shape[1] + xs
+        _, first = np.unique(cell_ids[::-1], return_index=True)
+        keep = len(cell_ids) - 1 - first
+        self.cells[ys[keep], xs[keep]] = chars[keep]
+        self.colours[ys[keep], xs[keep]] = colours[keep]
+
+    def flush(self, screen):
+        for y in np.flatnonzero(self.cells.any(axis=1)).tolist():
+            row = self.cells[y]
+            xs = np.flatnonzero(row)
+            colours = self.colours[y, xs]
+            for colour in np.unique(colours).tolist():
+                cols = xs[colours == colour]
+                start = int(cols[0])
+                span = np.full(int(cols[-1]) + 1 - start, ord(' '), dtype='<u4')
+                span[cols - start] = row[cols]
+                # Transparent spaces leave other colours' cells untouched
+                screen.print_at(span.tobytes().decode('utf-32-le'),
+                                start, y, colour=colour, transparent=True)
+        self.cells[:] = 0
+
 def create_effects(screen, mode):
     """Create persistent background effects based on mode"""
     effects = []
@@ -59,7 +190,7 @@ def create_effects(screen, mode):
 
     if mode in [VisualizerMode.STANDARD, VisualizerMode.INSANE]:
         # Add plasma for standard and insane
-        plasma = Plasma(screen.height, screen.width, 16)
+        plasma = CachedPlasma(screen.height, screen.width, 16)
         effects.append(
             Print(screen, plasma, x=0, y=0, transparent=True, colour=Screen.COLOUR_GREEN)
         )
@@ -76,7 +207,7 @@ def create_effects(screen, mode):
 
     return effects
 
-def create_fireworks(screen, x, y, intensity, mode):
+def create_fireworks(screen, x, y, intensity, mode, rand):
     """Create firework effects based on mode and intensity"""
     explosions = []
 
@@ -84,40 +215,41 @@ def create_fireworks(screen, x, y, intensity, mode):
         # Simple mode: just one firework type
         num_fireworks = min(int(intensity * 3) + 1, 3)
         for _ in range(num_fireworks):
-            fx = x + random.randint(-2, 2)
-            fy = y + random.randint(-1, 1)
-            effect = RingFirework(screen, fx, fy, random.randint(10, 15), 15)
+            fx = x + rand.randint(-2, 2)
+            fy = y + rand.randint(-1, 1)
+            # The rocket uses the first 10 frames; the ring needs at least one
+            effect = RingFirework(screen, fx, fy, rand.randint(11, 15), 15)
             explosions.append(effect)
 
     elif mode == VisualizerMode.STANDARD:
         # Standard mode: mix of firework types
         num_fireworks = min(int(intensity * 6) + 2, 6)
-        firework_types = [RingFirework, SerpentFirework, StarFirework]
-
         for _ in range(num_fireworks):
-            fx = x + random.randint(-3, 3)
-            fy = y + random.randint(-2, 2)
-            firework_class = random.choice(firework_types)
-            effect = firework_class(screen, fx, fy, random.randint(15, 20), 20)
+            fx = x + rand.randint(-3, 3)
+            fy = y + rand.randint(-2, 2)
+            firework_class = rand.choice(FIREWORK_TYPES_STANDARD)
+            effect = firework_class(screen, fx, fy, rand.randint(15, 20), 20)
             explosions.append(effect)
 
     else:  # INSANE
         # Insane mode: all firework types, maximum count
         num_fireworks = min(int(intensity * 12) + 3, 12)
-        firework_types = [RingFirework, SerpentFirework, StarFirework, PalmFirework]
-
         for _ in range(num_fireworks):
-            fx = x + random.randint(-5, 5)
-            fy = y + random.randint(-3, 3)
+            fx = x + rand.randint(-5, 5)
+            fy = y + rand.randint(-3, 3)
             # Use multiple types at once for chaos
-            for ft in random.sample(firework_types, min(2, len(firework_types))):
-                effect = ft(screen, fx + random.randint(-2, 2),
-                          fy + random.randint(-1, 1),
-                          random.randint(20, 30), 25)
+            for ft in rand.sample(FIREWORK_TYPES_INSANE, 2):
+                effect = ft(screen, fx + rand.randint(-2, 2),
+                          fy + rand.randint(-1, 1),
+                          rand.randint(20, 30), 25)
                 explosions.append(effect)
 
     return explosions
 
+# Frames between get_busy() checks for the end of the track; at 30-40 FPS
+# the loop still stops within a few hundred milliseconds of the song ending
+TRACK_POLL_FRAMES = 8
+
 def demo(screen, audio_file, mode):
     """Main visualization function with configurable mode"""
 
@@ -127,43 +259,33 @@ def demo(screen, audio_file, mode):
         time.sleep(2)
         return
 
-    # Start audio playback
+    # Create persistent background effects based on mode
+    effects = create_effects(screen, mode)
+
+    # Initialise each effect once, as a Scene would; they keep their state
+    # (Matrix trails, star positions) from frame to frame after that
+    for effect in effects:
+        effect.reset()
+
+    # Start audio playback once the effects (and their caches) are built
     pygame.mixer.init()
     pygame.mixer.music.load(audio_file)
     pygame.mixer.music.play()
 
-    # Create persistent background effects based on mode
-    effects = create_effects(screen, mode)
-
     # Configuration based on mode
-    if mode == VisualizerMode.SIMPLE:
-        beat_interval = 0.5  # 120 BPM
-        sub_beat_interval = 0.25
-        target_fps = 30
-        frame_sleep = 1.0 / target_fps
-        max_explosions = 20
-    elif mode == VisualizerMode.STANDARD:
-        beat_interval = 0.5  # 120 BPM
-        sub_beat_interval = 0.125
-        target_fps = 40
-        frame_sleep = 1.0 / target_fps
-        max_explosions = 40
-    else:  # INSANE
-        beat_interval = 0.5  # 120 BPM
-        sub_beat_interval = 0.125
-        target_fps = 40
-        frame_sleep = 1.0 / target_fps
-        max_explosions = 100
+    cfg = MODE_TABLE[mode]
+    beat_interval = 0.5  # 120 BPM
 
     # Variables for beat simulation
     # WARNING: This is SIMULATED timing, not actual beat detection!
     # Real audio analysis would require working librosa/aubio integration
     frame = 0
-    start_time = time.time()
+    start_time = time.monotonic()
     beat_count = 0
-    active_explosions = []
-    last_beat_time = time.time()
-    last_sub_beat = time.time()
+    active_explosions = deque()  # (death_frame, effect), oldest first
+    last_beat_time = time.monotonic()
+    last_sub_beat = time.monotonic()
+    next_deadline = time.monotonic()
 
     # Color schemes
     color_schemes = [
@@ -172,19 +294,31 @@ def demo(screen, audio_file, mode):
         [Screen.COLOUR_GREEN, Screen.COLOUR_YELLOW, Screen.COLOUR_WHITE],
         [Screen.COLOUR_MAGENTA, Screen.COLOUR_YELLOW, Screen.COLOUR_CYAN],
     ]
+    scheme_luts = np.array(color_schemes, dtype=np.uint8)
     current_scheme_idx = 0
 
-    # ASCII art patterns
-    art_patterns = GEOMETRY_PATTERNS + STAR_PATTERNS if mode != VisualizerMode.SIMPLE else []
+    # ASCII art patterns, split into lines once
+    art_patterns = [art.strip().split('\n') for art in GEOMETRY_PATTERNS + STAR_PATTERNS] \
+        if cfg.overlays else []
+
+    # Overlay grid for the single-cell flash and sparkle phases
+    overlay = CellGrid(screen.height, screen.width)
+    rng = np.random.default_rng()
+    rand = random.Random()
+    flash_ys, flash_xs = np.mgrid[0:screen.height:cfg.flash_step,
+                                  0:screen.width:cfg.flash_step + 1]
+    flash_ys, flash_xs = flash_ys.ravel(), flash_xs.ravel()
 
     running = True
     intensity = 0.5
 
     try:
-        while running and pygame.mixer.music.get_busy():
-            screen.clear()
+        while running:
+            # Only wipe the back buffer; refresh() diffs it against the front
+            # buffer and emits just the cells that changed since last frame
+            screen.clear_buffer(Screen.COLOUR_WHITE, Screen.A_NORMAL, Screen.COLOUR_BLACK)
 
-            current_time = time.time()
+            current_time = time.monotonic()
             elapsed = current_time - start_time
 
             # Main beat (SIMULATED - not synced to actual audio!)
@@ -193,99 +327,82 @@ def demo(screen, audio_file, mode):
                 beat_count += 1
 
                 # Change color scheme periodically
-                if beat_count % (8 if mode != VisualizerMode.SIMPLE else 16) == 0:
+                if beat_count % cfg.scheme_period == 0:
                     current_scheme_idx = (current_scheme_idx + 1) % len(color_schemes)
 
                 # Vary intensity
-                intensity = 0.7 + random.random() * 0.3 if mode != VisualizerMode.SIMPLE else 0.5
+                intensity = cfg.intensity_base + rand.random() * cfg.intensity_range
 
                 # Create fireworks
-                for _ in range(1 if mode == VisualizerMode.SIMPLE else 3):
-                    x = random.randint(5, screen.width - 5)
-                    y = random.randint(5, screen.height - 5)
+                for _ in range(cfg.fireworks_per_beat):
+                    x = rand.randint(5, screen.width - 5)
+                    y = rand.randint(5, screen.height - 5)
 
-                    new_explosions = create_fireworks(screen, x, y, intensity, mode)
+                    new_explosions = create_fireworks(screen, x, y, intensity, mode, rand)
                     for explosion in new_explosions:
-                        if len(active_explosions) < max_explosions:
-                            active_explosions.append({
-                                'effect': explosion,
-                                'birth': frame,
-                                'lifetime': 30 if mode == VisualizerMode.SIMPLE else 50
-                            })
+                        if len(active_explosions) < cfg.max_explosions:
+                            active_explosions.append((frame + cfg.firework_lifetime, explosion))
 
                 # Screen flash on strong beats (not in simple mode)
-                if mode != VisualizerMode.SIMPLE and beat_count % 2 == 0:
-                    flash_chars = ['█', '▓', '▒', '░'] if mode == VisualizerMode.INSANE else ['*', '#']
-                    flash_char = random.choice(flash_chars)
-                    current_colors = color_schemes[current_scheme_idx]
-
-                    step = 3 if mode == VisualizerMode.INSANE else 4
-                    for y in range(0, screen.height, step):
-                        for x in range(0, screen.width, step + 1):
-                            if random.random() < (intensity * 0.7):
-                                screen.print_at(flash_char, x, y,
-                                              colour=random.choice(current_colors))
+                if cfg.overlays and beat_count % 2 == 0:
+                    flash_char = rand.choice(cfg.flash_chars)
+                    current_colors = scheme_luts[current_scheme_idx]
+
+                    lit = rng.random(len(flash_xs)) < (intensity * 0.7)
+                    n_lit = int(lit.sum())
+                    overlay.stamp(flash_ys[lit], flash_xs[lit], ord(flash_char),
+                                  current_colors[rng.integers(0, len(current_colors), n_lit)])
+                    overlay.flush(screen)
 
                 # Text explosions (standard and insane only)
-                if mode != VisualizerMode.SIMPLE and beat_count % 4 == 0:
-                    crazy_texts = ["BOOM!", "BANG!", "WOW!"] if mode == VisualizerMode.STANDARD else \
-                                 ["BOOM!", "BANG!", "WOW!", "CRAZY!", "INSANE!", "WILD!", "SICK!"]
-                    text = random.choice(crazy_texts)
-                    text_color = random.choice([
-                        Screen.COLOUR_RED, Screen.COLOUR_YELLOW,
-                        Screen.COLOUR_MAGENTA, Screen.COLOUR_CYAN
-                    ])
-                    x_pos = random.randint(0, max(0, screen.width - 30))
-                    y_pos = random.randint(5, max(5, screen.height - 10))
-
-                    figlet = FigletText(text, font='banner' if len(text) < 6 else 'standard')
-                    for i, line in enumerate(str(figlet).split('\n')):
+                if cfg.overlays and beat_count % 4 == 0:
+                    text = rand.choice(cfg.crazy_texts)
+                    text_color = rand.choice(TEXT_COLOURS)
+                    x_pos = rand.randint(0, max(0, screen.width - 30))
+                    y_pos = rand.randint(5, max(5, screen.height - 10))
+
+                    for i, line in enumerate(FIGLET_CACHE[(text, figlet_font(text))]):
                         if y_pos + i < screen.height - 2:
                             screen.print_at(line, x_pos, y_pos + i, colour=text_color)
 
                 # Display ASCII art (standard and insane)
-                if art_patterns and mode != VisualizerMode.SIMPLE and random.random() < 0.5:
-                    art = random.choice(art_patterns)
-                    art_x = random.randint(0, max(0, screen.width - 20))
-                    art_y = random.randint(0, max(0, screen.height - 10))
-                    art_color = random.choice(color_schemes[current_scheme_idx])
+                if art_patterns and rand.random() < 0.5:
+                    art = rand.choice(art_patterns)
+                    art_x = rand.randint(0, max(0, screen.width - 20))
+                    art_y = rand.randint(0, max(0, screen.height - 10))
+                    art_color = rand.choice(color_schemes[current_scheme_idx])
 
-                    for i, line in enumerate(art.strip().split('\n')):
+                    for i, line in enumerate(art):
                         if art_y + i < screen.height - 2:
                             screen.print_at(line, art_x, art_y + i, colour=art_color)
 
             # Sub-beats for continuous effects (not in simple mode)
-            if mode != VisualizerMode.SIMPLE and current_time - last_sub_beat >= sub_beat_interval:
+            if cfg.overlays and current_time - last_sub_beat >= cfg.sub_beat_interval:
                 last_sub_beat = current_time
 
                 # Sparkles
-                num_sparkles = int(intensity * (30 if mode == VisualizerMode.STANDARD else 50))
-                for _ in range(num_sparkles):
-                    x = random.randint(0, screen.width - 1)
-                    y = random.randint(0, screen.height - 1)
-                    spark_chars = ['*', '+', '.'] if mode == VisualizerMode.STANDARD else \
-                                 ['*', '+', '.', '·', '°', '×', '÷']
-                    spark_char = random.choice(spark_chars)
-                    spark_color = random.choice([
-                        Screen.COLOUR_WHITE, Screen.COLOUR_YELLOW,
-                        Screen.COLOUR_CYAN
-                    ])
-                    screen.print_at(spark_char, x, y, colour=spark_color)
+                num_sparkles = int(intensity * cfg.sparkle_count)
+                spark_chars = cfg.sparkle_chars
+                pts = rng.integers([0, 0], [screen.height, screen.width], size=(num_sparkles, 2))
+                overlay.stamp(
+                    pts[:, 0], pts[:, 1],
+                    spark_chars[rng.integers(0, len(spark_chars), num_sparkles)],
+                    SPARK_COLOURS[rng.integers(0, len(SPARK_COLOURS), num_sparkles)]
+                )
+                overlay.flush(screen)
 
             # Update persistent background effects
             for effect in effects:
-                effect.reset()
                 effect._update(frame)
 
-            # Update active explosions
-            active_explosions = [
-                exp for exp in active_explosions
-                if frame - exp['birth'] < exp['lifetime']
-            ]
+            # Update active explosions; every explosion in a mode shares one
+            # lifetime, so the deque stays sorted by death frame
+            while active_explosions and active_explosions[0][0] <= frame:
+                active_explosions.popleft()
 
-            for exp in active_explosions:
-                exp['effect'].reset()
-                exp['effect']._update(frame)
+            # Fireworks reset themselves on construction
+            for _, effect in active_explosions:
+                effect._update(frame)
 
             # Status bar
             info_text = f"Time: {elapsed:.1f}s | Beats: {beat_count} | Mode: {mode.value} | FPS: {int(frame/elapsed if elapsed > 0 else 0)}"
@@ -318,8 +435,20 @@ def demo(screen, audio_file, mode):
             if event and event.key_code in [ord('q'), ord('Q'), Screen.ctrl('c')]:
                 running = False
 
+            # Stop when the song ends, polling the mixer only every few frames
+            if frame % TRACK_POLL_FRAMES == 0 and not pygame.mixer.music.get_busy():
+                running = False
+
             frame += 1
-            time.sleep(frame_sleep)
+
+            # Sleep to a fixed cadence so heavy frames don't push later ones
+            # back; on an overrun, drop the frame rather than catch up
+            next_deadline += cfg.frame_sleep
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_deadline = time.monotonic()
 
     finally:
         # Cleanup
@@ -33,7 +33,7 @@ WARNING: Beat detection is currently SIMULATED at 120 BPM.
 
 Requirements:
   - Python 3.13+
-  - pygame and asciimatics (install with: uv pip install pygame asciimatics)
+  - pygame, asciimatics and numpy (install with: uv pip install pygame asciimatics numpy)
   - For NixOS users: enter nix-shell first
 
 Examples:
@@ -97,18 +97,18 @@ async function runVisualizer(audioFile, options) {
     if (error.exitCode === 127) {
       console.error('\nError: Python 3 not found');
       console.error('Please install Python 3.13+ and required packages:');
-      console.error('  $ pip install pygame asciimatics');
+      console.error('  $ pip install pygame asciimatics numpy');
       console.error('\nFor NixOS users:');
       console.error('  $ nix-shell');
-      console.error('  $ uv pip install pygame asciimatics');
+      console.error('  $ uv pip install pygame asciimatics numpy');
     } else if (error.signal === 'SIGINT') {
       console.log('\n\n👋 Visualizer stopped by user');
     } else if (error.stderr && error.stderr.includes('ModuleNotFoundError')) {
       console.error('\nError: Python packages not installed');
       console.error('Install required packages:');
-      console.error('  $ pip install pygame asciimatics');
+      console.error('  $ pip install pygame asciimatics numpy');
       console.error('Or with uv:');
-      console.error('  $ uv pip install pygame asciimatics');
+      console.error('  $ uv pip install pygame asciimatics numpy');
     } else if (error.message) {
       console.error(`\nVisualizer error: ${error.message}`);
       if (error.stderr) {